@@ -6,12 +6,12 @@ Note: The actual Lovable project uses TypeScript edge functions.
 This Python code is provided as a reference implementation.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 import os
 import json
 import requests
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator
 from collections import defaultdict
 import heapq
 import random
@@ -23,6 +23,15 @@ CORS(app)
 LOVABLE_API_KEY = os.getenv('LOVABLE_API_KEY', 'your-api-key-here')
 AI_GATEWAY_URL = "https://ai.gateway.lovable.dev/v1/chat/completions"
 
+# Outfit analyzer rules (shared by single and batch analysis)
+OUTFIT_BASE_SCORE = 60
+OUTFIT_MAX_SCORE = 95
+OUTFIT_PRICE_LIMIT = 15000
+
+# Batch outfit analyzer (streamed responses are written in chunks of results)
+BATCH_CHUNK_SIZE = 1000
+BATCH_STREAM_THRESHOLD = 1000
+
 # FAQ Knowledge Base (from uploaded PDF)
 FAQ_KNOWLEDGE = """
 Orders & Payments:
@@ -407,6 +416,117 @@ class GeneticFashionOptimizer:
         return [outfit for outfit, score in best_outfits]
 
 
+def analyze_outfit(products):
+    """
+    Apply the expert system rules to a single outfit
+
+    Args:
+        products: List of product dictionaries in the outfit
+
+    Returns:
+        Dictionary with compatibility score, style coherence, price balance and tips
+    """
+    total_price = sum(p.get('price', 0) for p in products)
+    categories = set(p.get('category') for p in products)
+    
+    # Calculate compatibility score
+    compatibility_score = OUTFIT_BASE_SCORE
+    if len(categories) > 1:
+        compatibility_score += 15
+    if total_price < OUTFIT_PRICE_LIMIT:
+        compatibility_score += 10
+    if len(products) >= 2:
+        compatibility_score += 10
+    
+    return {
+        'compatibilityScore': min(compatibility_score, OUTFIT_MAX_SCORE),
+        'styleCoherence': 'High' if len(products) > 1 else 'Low',
+        'priceBalance': 'Good' if total_price < OUTFIT_PRICE_LIMIT else 'High',
+        'totalCost': total_price,
+        'improvementTips': [
+            "Consider adding statement jewelry" if 'jewelry' not in categories else "Jewelry complements the outfit well",
+            "The color palette works well together",
+            "Good mix of traditional and contemporary elements"
+        ]
+    }
+
+
+class BatchOutfitAnalyzer:
+    """Expert system analysis for many outfits in a single request"""
+
+    def __init__(self, catalog):
+        self.catalog = {str(p['id']): p for p in catalog}
+
+    @staticmethod
+    def _product_error(product):
+        """Return an error message if a product cannot be scored"""
+        if not isinstance(product, dict):
+            return "Product must be an object"
+        price = product.get('price', 0)
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            return "Product price must be a number"
+        category = product.get('category')
+        if category is not None and not isinstance(category, str):
+            return "Product category must be a string"
+        return None
+
+    def resolve_outfit(self, outfit):
+        """
+        Resolve an outfit to its list of products
+
+        Args:
+            outfit: Either {"productIds": [...]} resolved against the catalog
+                or {"products": [...]} with inline products
+
+        Returns:
+            Tuple of (products, error message or None)
+        """
+        if not isinstance(outfit, dict):
+            return [], "Outfit must be an object"
+
+        if 'productIds' in outfit:
+            product_ids = outfit['productIds']
+            if not isinstance(product_ids, list):
+                return [], "productIds must be a list"
+            product_ids = [str(pid) for pid in product_ids]
+            missing = [pid for pid in product_ids if pid not in self.catalog]
+            if missing:
+                return [], f"Unknown product ids: {', '.join(missing)}"
+            products = [self.catalog[pid] for pid in product_ids]
+        else:
+            products = outfit.get('products')
+            if products is None:
+                products = []
+            if not isinstance(products, list):
+                return [], "products must be a list"
+            for product in products:
+                error = self._product_error(product)
+                if error:
+                    return [], error
+
+        if not products:
+            return [], "No products provided"
+
+        return products, None
+
+    def analyze(self, outfit):
+        """Analyze one outfit, reporting problems as an error entry"""
+        products, error = self.resolve_outfit(outfit)
+        if error:
+            return {'error': error}
+
+        try:
+            return analyze_outfit(products)
+        except Exception as e:
+            print(f"Error in batch outfit analyzer: {e}")
+            return {'error': str(e)}
+
+    def iter_results(self, outfits) -> Iterator[Dict[str, Any]]:
+        """Yield analysis results in input order, tagged with their index"""
+        for index, outfit in enumerate(outfits):
+            yield {'index': index, **self.analyze(outfit)}
+
+
 # Initialize AI assistant and search engines
 ai_assistant = AIFashionAssistant()
 search_engine = None
@@ -588,29 +708,7 @@ def outfit_analyzer():
         if not products:
             return jsonify({"error": "No products provided"}), 400
         
-        total_price = sum(p.get('price', 0) for p in products)
-        categories = set(p.get('category') for p in products)
-        
-        # Calculate compatibility score
-        compatibility_score = 60
-        if len(categories) > 1:
-            compatibility_score += 15
-        if total_price < 15000:
-            compatibility_score += 10
-        if len(products) >= 2:
-            compatibility_score += 10
-        
-        analysis = {
-            'compatibilityScore': min(compatibility_score, 95),
-            'styleCoherence': 'High' if len(products) > 1 else 'Low',
-            'priceBalance': 'Good' if total_price < 15000 else 'High',
-            'totalCost': total_price,
-            'improvementTips': [
-                "Consider adding statement jewelry" if 'jewelry' not in categories else "Jewelry complements the outfit well",
-                "The color palette works well together",
-                "Good mix of traditional and contemporary elements"
-            ]
-        }
+        analysis = analyze_outfit(products)
         
         return jsonify(analysis), 200
         
@@ -619,6 +717,51 @@ def outfit_analyzer():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/outfit-analyzer/batch', methods=['POST', 'OPTIONS'])
+def outfit_analyzer_batch():
+    """Analyze many outfits in one call using expert system rules"""
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    try:
+        data = request.json
+        outfits = data.get('outfits', [])
+
+        if not isinstance(outfits, list):
+            return jsonify({"error": "outfits must be a list"}), 400
+
+        if not outfits:
+            return jsonify({"error": "No outfits provided"}), 400
+
+        stream = data.get('stream', len(outfits) > BATCH_STREAM_THRESHOLD)
+        if not isinstance(stream, bool):
+            return jsonify({"error": "stream must be a boolean"}), 400
+
+        catalog = get_products()[0].json
+        analyzer = BatchOutfitAnalyzer(catalog)
+
+        # Stream newline-delimited JSON for very large batches
+        if stream:
+            def generate():
+                lines = []
+                for result in analyzer.iter_results(outfits):
+                    lines.append(json.dumps(result))
+                    if len(lines) >= BATCH_CHUNK_SIZE:
+                        yield '\n'.join(lines) + '\n'
+                        lines = []
+                if lines:
+                    yield '\n'.join(lines) + '\n'
+
+            return Response(generate(), status=200, mimetype='application/x-ndjson')
+
+        results = list(analyzer.iter_results(outfits))
+        return jsonify({'results': results, 'count': len(results)}), 200
+
+    except Exception as e:
+        print(f"Error in batch outfit analyzer: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -638,6 +781,7 @@ if __name__ == '__main__':
     print("  POST /api/fashion-recommendations - Get style recommendations")
     print("  POST /api/advanced-recommendations - AI-powered outfit suggestions")
     print("  POST /api/outfit-analyzer - Expert outfit analysis")
+    print("  POST /api/outfit-analyzer/batch - Batch outfit analysis")
     print("  GET  /api/products - List products")
     print("  GET  /health - Health check")
     print("=" * 60)
@@ -0,0 +1,178 @@
+"""
+Parity checks for the single and batch outfit analyzer endpoints
+
+Run with: pytest test_outfit_analyzer.py
+"""
+
+import json
+
+import pytest
+
+from main import app, get_products, BATCH_STREAM_THRESHOLD
+
+
+def reference_analysis(products):
+    """Original single-outfit expert system rules"""
+    total_price = sum(p.get('price', 0) for p in products)
+    categories = set(p.get('category') for p in products)
+
+    compatibility_score = 60
+    if len(categories) > 1:
+        compatibility_score += 15
+    if total_price < 15000:
+        compatibility_score += 10
+    if len(products) >= 2:
+        compatibility_score += 10
+
+    return {
+        'compatibilityScore': min(compatibility_score, 95),
+        'styleCoherence': 'High' if len(products) > 1 else 'Low',
+        'priceBalance': 'Good' if total_price < 15000 else 'High',
+        'totalCost': total_price,
+        'improvementTips': [
+            "Consider adding statement jewelry" if 'jewelry' not in categories else "Jewelry complements the outfit well",
+            "The color palette works well together",
+            "Good mix of traditional and contemporary elements"
+        ]
+    }
+
+
+PARITY_CASES = [
+    # int total, dress + jewelry, score capped at 95
+    [{'price': 4500, 'category': 'dress'}, {'price': 8500, 'category': 'jewelry'}],
+    # float total
+    [{'price': 4500.5, 'category': 'dress'}, {'price': 2500, 'category': 'jewelry'}],
+    # no jewelry, over budget
+    [{'price': 9000, 'category': 'dress'}, {'price': 7000, 'category': 'shoes'}],
+    # missing category and missing price
+    [{'category': 'dress'}, {'price': 3000}],
+    # single product
+    [{'price': 12000, 'category': 'jewelry'}],
+    # same category twice
+    [{'price': 100, 'category': 'dress'}, {'price': 200, 'category': 'dress'}],
+]
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def catalog():
+    with app.app_context():
+        return {p['id']: p for p in get_products()[0].json}
+
+
+def post_batch(client, outfits, **extra):
+    response = client.post('/api/outfit-analyzer/batch', json={'outfits': outfits, **extra})
+    if response.mimetype == 'application/x-ndjson':
+        lines = response.get_data(as_text=True).splitlines()
+        return response, [json.loads(line) for line in lines]
+    return response, response.get_json().get('results')
+
+
+@pytest.mark.parametrize('products', PARITY_CASES)
+def test_single_matches_reference(client, products):
+    response = client.post('/api/outfit-analyzer', json={'products': products})
+    assert response.status_code == 200
+    assert json.dumps(response.get_json(), sort_keys=True) == json.dumps(reference_analysis(products), sort_keys=True)
+
+
+def test_batch_matches_reference(client, catalog):
+    outfits = [{'products': products} for products in PARITY_CASES]
+    outfits += [{'productIds': ['1', '2']}, {'productIds': ['5']}, {'productIds': ['3', '6', '4']}]
+    expected = [reference_analysis(products) for products in PARITY_CASES]
+    expected += [
+        reference_analysis([catalog[pid] for pid in outfit['productIds']])
+        for outfit in outfits[len(PARITY_CASES):]
+    ]
+
+    response, results = post_batch(client, outfits)
+    assert response.status_code == 200
+    assert [r.pop('index') for r in results] == list(range(len(outfits)))
+    assert json.dumps(results, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+@pytest.mark.parametrize('outfit, error', [
+    ({'productIds': ['1', '99']}, "Unknown product ids: 99"),
+    ({'productIds': '12'}, "productIds must be a list"),
+    ({'products': 'x'}, "products must be a list"),
+    ({'products': []}, "No products provided"),
+    ({'products': ['x']}, "Product must be an object"),
+    ({'products': [{'price': None}]}, "Product price must be a number"),
+    ({'products': [{'price': '4500'}]}, "Product price must be a number"),
+    ({'products': [{'price': True}]}, "Product price must be a number"),
+    ({'products': [{'price': [1, 2]}]}, "Product price must be a number"),
+    ({'products': [{'price': 1, 'category': {'a': 1}}]}, "Product category must be a string"),
+    ({'products': [{'price': 1, 'category': ['dress']}]}, "Product category must be a string"),
+    ('not an outfit', "Outfit must be an object"),
+])
+def test_batch_reports_errors_per_outfit(client, outfit, error):
+    response, results = post_batch(client, [{'productIds': ['1']}, outfit])
+    assert response.status_code == 200
+    assert 'error' not in results[0]
+    assert results[1] == {'index': 1, 'error': error}
+
+
+def test_single_keeps_original_input_handling(client):
+    response = client.post('/api/outfit-analyzer', json={'products': [{'price': True}]})
+    assert response.status_code == 200
+    assert response.get_json()['totalCost'] == 1
+
+    response = client.post('/api/outfit-analyzer', json={'products': [{'price': '4500'}]})
+    assert response.status_code == 500
+
+
+@pytest.mark.parametrize('price', [2 ** 60 + 1, 2 ** 70])
+def test_large_integer_prices_are_exact(client, price):
+    products = [{'price': price, 'category': 'dress'}]
+    expected = json.dumps(reference_analysis(products), sort_keys=True)
+
+    response = client.post('/api/outfit-analyzer', json={'products': products})
+    assert json.dumps(response.get_json(), sort_keys=True) == expected
+
+    response, results = post_batch(client, [{'products': products}])
+    results[0].pop('index')
+    assert json.dumps(results[0], sort_keys=True) == expected
+
+
+def test_batch_rejects_non_list_outfits(client):
+    response = client.post('/api/outfit-analyzer/batch', json={'outfits': {'productIds': ['1']}})
+    assert response.status_code == 400
+
+
+def test_batch_rejects_non_bool_stream(client):
+    response = client.post('/api/outfit-analyzer/batch', json={'outfits': [{'productIds': ['1']}], 'stream': 'false'})
+    assert response.status_code == 400
+
+
+def test_large_batch_streams_with_inline_errors(client, catalog):
+    outfits = [{'productIds': ['1', '2']}] * (BATCH_STREAM_THRESHOLD + 500)
+    outfits.append({'products': [{'price': None}]})
+
+    response, results = post_batch(client, outfits)
+    assert response.mimetype == 'application/x-ndjson'
+    assert len(results) == len(outfits)
+    assert [r['index'] for r in results] == list(range(len(outfits)))
+
+    expected = reference_analysis([catalog['1'], catalog['2']])
+    assert all({k: v for k, v in r.items() if k != 'index'} == expected for r in results[:-1])
+    assert results[-1]['error'] == "Product price must be a number"
+
+
+def test_stream_flag_on_small_batch(client):
+    response, results = post_batch(client, [{'productIds': ['1']}], stream=True)
+    assert response.mimetype == 'application/x-ndjson'
+    assert results[0]['index'] == 0
+
+
+def test_stream_reports_bad_outfit_without_failing_others(client, catalog):
+    outfits = [{'productIds': ['1', '2']}, {'products': [{'price': 1, 'category': {'a': 1}}]}]
+    response, results = post_batch(client, outfits, stream=True)
+    assert response.status_code == 200
+    assert [r.pop('index') for r in results] == [0, 1]
+    assert results[0] == reference_analysis([catalog['1'], catalog['2']])
+    assert results[1] == {'error': "Product category must be a string"}